@@ -1,13 +1,15 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import json
 import datetime
 import logging
 import hashlib
+import hmac
 import uuid
 from optparse import OptionParser
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import orjson
 
 import field
 import scoring
@@ -60,12 +62,7 @@ class OnlineScoreRequest(field.FieldHolder):
     gender = field.GenderField(required=False, nullable=True)
 
     def has(self):
-        has_dict = {}
-        for field_name in self.field_dict:
-            field_value = getattr(self, field_name)
-            if field_value is not None:
-                has_dict[field_name] = field_value
-        return has_dict
+        return {field_name: value for field_name, value in self.struct.items() if value is not None}
 
     def validate(self):
         super().validate()
@@ -89,24 +86,27 @@ class MethodRequest(field.FieldHolder):
         return self.login == ADMIN_LOGIN
 
 
+_admin_digest_cache = (None, None)
+
+
 def check_auth(request):
+    global _admin_digest_cache
     if request.is_admin():
-        hash_str = '{:s}{:s}'.format(datetime.datetime.now().strftime("%Y%m%d%H"), ADMIN_SALT)
-    else:
-        hash_str = '{:s}{:s}{:s}'.format(request.account, request.login, SALT)
+        hour_str = datetime.datetime.now().strftime("%Y%m%d%H")
+        if hour_str != _admin_digest_cache[0]:
+            digest = hashlib.sha512((hour_str + ADMIN_SALT).encode('utf-8')).hexdigest()
+            _admin_digest_cache = (hour_str, digest)
+        return hmac.compare_digest(_admin_digest_cache[1], request.token or '')
+    hash_str = (request.account or '') + (request.login or '') + SALT
     digest = hashlib.sha512(hash_str.encode('utf-8')).hexdigest()
-    if digest == request.token:
-        return True
-    return False
+    return hmac.compare_digest(digest, request.token or '')
 
 
 def clients_interests_handler(ctx, store, method_request):
     clients_interests_request = ClientsInterestsRequest(method_request.arguments)
     clients_interests_request.validate()
 
-    interests_dict = {}
-    for client_id in clients_interests_request.client_ids:
-        interests_dict[client_id] = scoring.get_interests(store, client_id)
+    interests_dict = scoring.get_interests_many(store, clients_interests_request.client_ids)
     ctx['nclients'] = clients_interests_request.nclients()
     return interests_dict, OK
 
@@ -130,8 +130,11 @@ def online_score_handler(ctx, store, method_request):
     return {'score': score}, OK
 
 
+METHOD_ROUTER = {'online_score': online_score_handler, 'clients_interests': clients_interests_handler}
+
+
 def method_handler(request, ctx, store):
-    router = {'online_score': online_score_handler, 'clients_interests': clients_interests_handler}
+    router = METHOD_ROUTER
     response, code = None, None
 
     method_request = MethodRequest(request['body'])
@@ -151,6 +154,9 @@ def method_handler(request, ctx, store):
 
 
 class MainHTTPHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    timeout = 10
+    wbufsize = 16384
     router = {"method": method_handler}
     store = None
 
@@ -176,8 +182,8 @@ class MainHTTPHandler(BaseHTTPRequestHandler):
         request = None
         data_string = None
         try:
-            data_string = self.rfile.read(int(self.headers['Content-Length']))
-            request = json.loads(data_string)
+            data_string = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            request = orjson.loads(data_string)
         except:
             code = BAD_REQUEST
 
@@ -197,16 +203,18 @@ class MainHTTPHandler(BaseHTTPRequestHandler):
         return
 
     def make_response(self, response, code, context):
-        self.send_response(code)
-        self.send_header("Content-Type", "application/json")
-        self.end_headers()
         if code not in ERRORS:
             r = {"response": response, "code": code}
         else:
             r = {"error": response or ERRORS.get(code, "Unknown Error"), "code": code}
         context.update(r)
         logging.info(context)
-        self.wfile.write(json.dumps(r).encode("utf-8"))
+        body = orjson.dumps(r, option=orjson.OPT_NON_STR_KEYS)
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
         return
 
     def log_message(self, format, *args):
@@ -223,7 +231,7 @@ if __name__ == "__main__":
         level=logging.INFO,
         format='[%(asctime)s] %(levelname).1s %(message)s',
         datefmt='%Y.%m.%d %H:%M:%S')
-    server = HTTPServer(("localhost", opts.port), MainHTTPHandler)
+    server = ThreadingHTTPServer(("localhost", opts.port), MainHTTPHandler)
     logging.info("Starting server at %s" % opts.port)
     try:
         server.serve_forever()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import asyncio
+import json
+import logging
+import uuid
+from optparse import OptionParser
+
+import api
+import scoring
+
+
+async def clients_interests_handler(ctx, store, method_request):
+    clients_interests_request = api.ClientsInterestsRequest(method_request.arguments)
+    clients_interests_request.validate()
+
+    client_ids = clients_interests_request.client_ids
+    interests = await asyncio.gather(*[scoring.get_interests_async(store, client_id) for client_id in client_ids])
+    interests_dict = dict(zip(client_ids, interests))
+    ctx['nclients'] = clients_interests_request.nclients()
+    return interests_dict, api.OK
+
+
+async def online_score_handler(ctx, store, method_request):
+    online_score_request = api.OnlineScoreRequest(method_request.arguments)
+    online_score_request.validate()
+
+    if method_request.is_admin():
+        score = 42
+    else:
+        score = await scoring.get_score_async(
+            store,
+            online_score_request.phone,
+            online_score_request.email,
+            birthday=online_score_request.birthday,
+            gender=online_score_request.gender,
+            first_name=online_score_request.first_name,
+            last_name=online_score_request.last_name)
+    ctx['has'] = online_score_request.has()
+    return {'score': score}, api.OK
+
+
+METHOD_ROUTER = {'online_score': online_score_handler, 'clients_interests': clients_interests_handler}
+
+
+async def method_handler(request, ctx, store):
+    response, code = None, None
+
+    method_request = api.MethodRequest(request['body'])
+    try:
+        method_request.validate()
+        if api.check_auth(method_request):
+            if method_request.method in METHOD_ROUTER:
+                handler = METHOD_ROUTER[method_request.method]
+                response, code = await handler(ctx, store, method_request)
+            else:
+                raise ValueError('unknown method')
+        else:
+            response, code = "Invalid token", api.FORBIDDEN
+    except ValueError as e:
+        response, code = str(e), api.INVALID_REQUEST
+    return response, code
+
+
+ROUTER = {"method": method_handler}
+STORE = None
+
+
+async def read_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body', False):
+            return b''.join(chunks)
+
+
+async def send_response(send, response, code, context):
+    if code not in api.ERRORS:
+        r = {"response": response, "code": code}
+    else:
+        r = {"error": response or api.ERRORS.get(code, "Unknown Error"), "code": code}
+    context.update(r)
+    logging.info(context)
+    body = json.dumps(r).encode('utf-8')
+    headers = [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode('ascii'))]
+    await send({'type': 'http.response.start', 'status': code, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def app(scope, receive, send):
+    if scope['type'] != 'http':
+        raise ValueError('unsupported scope type {!s}'.format(scope['type']))
+
+    headers = {name.decode('latin-1'): value.decode('latin-1') for name, value in scope.get('headers', [])}
+    context = {"request_id": headers.get('x-request-id', uuid.uuid4().hex)}
+    path = scope['path'].strip("/")
+
+    if scope['method'] == 'GET':
+        code = api.OK if path == 'ping' else api.NOT_FOUND
+        await send_response(send, None, code, context)
+        return
+
+    response, code = {}, api.INVALID_REQUEST
+    request = None
+    data_string = await read_body(receive)
+    try:
+        request = json.loads(data_string)
+    except:
+        code = api.BAD_REQUEST
+
+    if request:
+        logging.info("%s: %s %s" % (scope['path'], data_string, context["request_id"]))
+        if path in ROUTER:
+            try:
+                response, code = await ROUTER[path]({"body": request, "headers": headers}, context, STORE)
+            except Exception as e:
+                logging.exception("Unexpected error: %s" % e)
+                code = api.INTERNAL_ERROR
+        else:
+            code = api.NOT_FOUND
+
+    await send_response(send, response, code, context)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    op = OptionParser()
+    op.add_option("-p", "--port", action="store", type=int, default=8080)
+    op.add_option("-l", "--log", action="store", default=None)
+    op.add_option("-w", "--workers", action="store", type=int, default=1)
+    (opts, args) = op.parse_args()
+    logging.basicConfig(
+        filename=opts.log,
+        level=logging.INFO,
+        format='[%(asctime)s] %(levelname).1s %(message)s',
+        datefmt='%Y.%m.%d %H:%M:%S')
+    logging.info("Starting asyncio server at %s" % opts.port)
+    uvicorn.run("app:app", host="localhost", port=opts.port, workers=opts.workers, loop="uvloop", http="httptools")
@@ -1,28 +1,45 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import re
 import datetime
+import sys
+import time
+
+_MISSING = object()
+
+_today_cache = (0.0, None)
+
+
+def _today():
+    global _today_cache
+    now = time.time()
+    if now - _today_cache[0] > 1.0:
+        _today_cache = (now, datetime.date.today())
+    return _today_cache[1]
 
 
 class Field(object):
+    __slots__ = ('field_name', 'required', 'nullable')
+
     def __init__(self, required=False, nullable=False, field_name=None):
         self.field_name = field_name
         self.required = required
         self.nullable = nullable
 
     def validate(self, struct):
-        value = None
-        if self.field_name in struct:
-            value = struct[self.field_name]
-        elif self.required:
-            raise ValueError('required field absent')
-        value_converted = None
-        if value is not None:
-            value_converted = self.validate_convert_value(value)
-        elif not self.nullable:
-            raise ValueError('field must not be null')
-        return value_converted
+        value = struct.get(self.field_name, _MISSING)
+        if value is _MISSING:
+            if self.required:
+                raise ValueError('required field absent')
+            value = None
+        return self.validate_value(value)
+
+    def validate_value(self, value):
+        if value is None:
+            if not self.nullable:
+                raise ValueError('field must not be null')
+            return None
+        return self.validate_convert_value(value)
 
     def validate_convert_value(self, value):
         return value
@@ -38,45 +55,125 @@ class FieldHolderMeta(type):
         for attr_name, attr_value in attrs.items():
             if isinstance(attr_value, Field):
                 if attr_name in field_dict:
-                    raise Exception('Field redefined in {:s}'.format(name))
-                attr_value.field_name = attr_name
+                    raise Exception(f'Field redefined in {name}')
+                attr_value.field_name = sys.intern(attr_name)
                 new_field_dict[attr_name] = attr_value
         for attr_name in new_field_dict:
             del attrs[attr_name]
         field_dict.update(new_field_dict)
         attrs['field_dict'] = field_dict
+        attrs['field_items'] = tuple(
+            (f_name, f_value, f_value.required, f_value.nullable) for f_name, f_value in field_dict.items())
+        attrs['__slots__'] = tuple(new_field_dict)
+        if field_dict and '__init__' not in attrs:
+            attrs['__init__'] = cls.make_init(field_dict)
         return super().__new__(cls, name, bases, attrs)
 
+    @staticmethod
+    def make_init(field_dict):
+        namespace = {'_MISSING': _MISSING}
+        lines = [
+            'def __init__(self, struct):',
+            '    self.struct_orig = struct',
+            '    if not isinstance(struct, dict):',
+            '        self.struct = {}',
+            "        self.error_msgs = ['struct must be object']",
+            '        return',
+            '    error_msgs = []',
+            '    struct_converted = {}',
+        ]
+        for field_name, field_value in field_dict.items():
+            convert_name = f'_convert_{field_name}'
+            namespace[convert_name] = field_value.validate_convert_value
+            lines.append(f'    value = struct.get({field_name!r}, _MISSING)')
+            lines.append('    if value is _MISSING:')
+            if field_value.required:
+                lines.append(f"        error_msgs.append('{field_name}: required field absent')")
+                null_check = 'elif'
+            else:
+                lines.append('        value = None')
+                null_check = 'if'
+            lines.append(f'    {null_check} value is None:')
+            if field_value.nullable:
+                lines.append(f'        struct_converted[{field_name!r}] = None')
+                lines.append(f'        self.{field_name} = None')
+            else:
+                lines.append(f"        error_msgs.append('{field_name}: field must not be null')")
+            lines.append('    else:')
+            lines.append('        try:')
+            lines.append(f'            value = {convert_name}(value)')
+            lines.append(f'            struct_converted[{field_name!r}] = value')
+            lines.append(f'            self.{field_name} = value')
+            lines.append('        except ValueError as e:')
+            lines.append(f"            error_msgs.append(f'{field_name}: {{e}}')")
+        lines.append('    self.struct = struct_converted')
+        lines.append('    self.error_msgs = error_msgs')
+        exec('\n'.join(lines), namespace)
+        return namespace['__init__']
+
 
 class FieldHolderBase(object):
+    __slots__ = ('struct_orig', 'struct', 'error_msgs')
+
     def __init__(self, struct):
         self.struct_orig = struct
+        if not isinstance(struct, dict):
+            self.struct = {}
+            self.error_msgs = ['struct must be object']
+            return
+        error_msgs = []
+        struct_converted = {}
+        for field_name, field_value, required, nullable in self.field_items:
+            value = struct.get(field_name, _MISSING)
+            if value is _MISSING:
+                if required:
+                    error_msgs.append(f'{field_name}: required field absent')
+                    continue
+                value = None
+            if value is None:
+                if not nullable:
+                    error_msgs.append(f'{field_name}: field must not be null')
+                    continue
+            else:
+                try:
+                    value = field_value.validate_convert_value(value)
+                except ValueError as e:
+                    error_msgs.append(f'{field_name}: {e}')
+                    continue
+            struct_converted[field_name] = value
+            setattr(self, field_name, value)
+        self.struct = struct_converted
+        self.error_msgs = error_msgs
 
     def validate(self):
+        if self.error_msgs:
+            raise ValueError('; '.join(self.error_msgs))
+
+    @classmethod
+    def validate_many(cls, structs):
+        holders = []
         error_msgs = []
-        struct = {}
-        for field_name, field_value in self.field_dict.items():
-            try:
-                struct[field_name] = field_value.validate(self.struct_orig)
-            except ValueError as e:
-                error_msgs.append('{:s}: {!s}'.format(field_name, e))
-        if error_msgs:
-            raise ValueError('; '.join(error_msgs))
-        self.struct = struct
-        for field_name, value in struct.items():
-            setattr(self, field_name, value)
+        for index, struct in enumerate(structs):
+            holder = cls(struct)
+            if holder.error_msgs:
+                holders.append(None)
+                error_msgs.append(f'{index}: ' + '; '.join(holder.error_msgs))
+            else:
+                holders.append(holder)
+        return holders, error_msgs
 
     def dump_fields(self):
-        print("Dump: {!s}".format(self))
+        print(f"Dump: {self}")
+        struct = self.struct if hasattr(self, "struct") else {}
         for field_name in self.field_dict:
             values = []
-            if hasattr(self, "struct") and field_name in self.struct:
-                value = self.struct[field_name]
-                values.append("\t\tvalid: {!s} ({!s})".format(value, type(value)))
-            if field_name in self.struct_orig:
-                value = self.struct_orig[field_name]
-                values.append("\t\torig: {!s} ({!s})".format(value, type(value)))
-            print("\t{:s}:\n{:s}".format(field_name, "\n".join(values) if values else "\t\tabsent"))
+            value = struct.get(field_name, _MISSING)
+            if value is not _MISSING:
+                values.append(f"\t\tvalid: {value} ({type(value)})")
+            value = self.struct_orig.get(field_name, _MISSING)
+            if value is not _MISSING:
+                values.append(f"\t\torig: {value} ({type(value)})")
+            print(f"\t{field_name}:\n" + ("\n".join(values) if values else "\t\tabsent"))
 
 
 class FieldHolder(FieldHolderBase, metaclass=FieldHolderMeta):
@@ -84,6 +181,8 @@ class FieldHolder(FieldHolderBase, metaclass=FieldHolderMeta):
 
 
 class CharField(Field):
+    __slots__ = ()
+
     def validate_convert_value(self, value):
         value = super().validate_convert_value(value)
         if not isinstance(value, str):
@@ -92,6 +191,8 @@ class CharField(Field):
 
 
 class ArgumentsField(Field):
+    __slots__ = ()
+
     def validate_convert_value(self, value):
         value = super().validate_convert_value(value)
         if not isinstance(value, dict):
@@ -100,11 +201,31 @@ class ArgumentsField(Field):
 
 
 class EmailField(CharField):
-    VALIDATE_EMAIL_RE = re.compile("^.+\\@(\\[?)[a-zA-Z0-9\\-\\.]+\\.([a-zA-Z]{2,3}|[0-9]{1,3})(\\]?)$")
+    __slots__ = ()
+
+    DOMAIN_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789.-')
 
     @staticmethod
     def is_valid_email(email):
-        return len(email) > 7 and re.match(EmailField.VALIDATE_EMAIL_RE, email) is not None
+        if len(email) <= 7:
+            return False
+        at = email.rfind('@')
+        if at < 1:
+            return False
+        domain = email[at + 1:]
+        if domain.startswith('['):
+            domain = domain[1:]
+        if domain.endswith(']'):
+            domain = domain[:-1]
+        dot = domain.rfind('.')
+        if dot < 1:
+            return False
+        body, tld = domain[:dot], domain[dot + 1:]
+        if not tld.isascii():
+            return False
+        if not (2 <= len(tld) <= 3 and tld.isalpha() or 1 <= len(tld) <= 3 and tld.isdigit()):
+            return False
+        return all(c in EmailField.DOMAIN_CHARS for c in body)
 
     def validate_convert_value(self, value):
         value = super().validate_convert_value(value)
@@ -114,18 +235,18 @@ class EmailField(CharField):
 
 
 class PhoneField(Field):
-    VALIDATE_PHONE_RE = re.compile("^7\\d+$")
+    __slots__ = ()
 
     @staticmethod
     def is_valid_phone(phone):
-        return len(phone) == 11 and re.match(PhoneField.VALIDATE_PHONE_RE, phone) is not None
+        return len(phone) == 11 and phone[0] == '7' and phone.isdecimal()
 
     def validate_convert_value(self, value):
         value = super().validate_convert_value(value)
-        if not isinstance(value, str) and not isinstance(value, int):
+        if type(value) is not str and type(value) is not int:
             raise ValueError('field must be string or number')
         else:
-            if isinstance(value, int):
+            if type(value) is int:
                 value = str(value)
             if not PhoneField.is_valid_phone(value):
                 raise ValueError('field must be valid phone, 11 digits, leading digit = 7')
@@ -133,21 +254,25 @@ class PhoneField(Field):
 
 
 class DateField(CharField):
-    DATE_FIELD_FORMAT = "%d.%m.%Y"
+    __slots__ = ()
 
     def validate_convert_value(self, value):
         value = super().validate_convert_value(value)
-        value = datetime.datetime.strptime(value, DateField.DATE_FIELD_FORMAT).date()
-        return value
+        if len(value) != 10 or not value.isascii() or value[2] != '.' or value[5] != '.':
+            raise ValueError('field must be date in DD.MM.YYYY format')
+        day, month, year = value[0:2], value[3:5], value[6:10]
+        if not (day.isdigit() and month.isdigit() and year.isdigit()):
+            raise ValueError('field must be date in DD.MM.YYYY format')
+        return datetime.date(int(year), int(month), int(day))
 
 
 class BirthDayField(DateField):
+    __slots__ = ()
+
     @staticmethod
     def is_valid_birthday(date):
-        td = datetime.date.today()
-        years = td.year - date.year
-        if td.month < date.month or (td.month == date.month and td.day < date.day):
-            years -= 1
+        td = _today()
+        years = td.year - date.year - ((td.month, td.day) < (date.month, date.day))
         return years <= 70
 
     def validate_convert_value(self, value):
@@ -158,20 +283,26 @@ class BirthDayField(DateField):
 
 
 class GenderField(Field):
+    __slots__ = ()
+
+    VALID_GENDERS = frozenset((0, 1, 2))
+
     def validate_convert_value(self, value):
         value = super().validate_convert_value(value)
-        if not isinstance(value, int):
+        if type(value) is not int:
             raise ValueError('field must be number')
-        elif value not in [0, 1, 2]:
+        elif value not in GenderField.VALID_GENDERS:
             raise ValueError('field must be 0, 1 or 2')
         return value
 
 
 class ClientIDsField(Field):
+    __slots__ = ()
+
     def validate_convert_value(self, value):
         value = super().validate_convert_value(value)
         if not isinstance(value, list):
             raise ValueError('field must be list')
-        elif not all(isinstance(x, int) for x in value):
+        elif not all(type(x) is int for x in value):
             raise ValueError('field must be list of numbers')
         return value
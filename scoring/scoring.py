@@ -20,3 +20,15 @@ def get_score(store, phone, email, birthday=None, gender=None, first_name=None,
 def get_interests(store, cid):
     interests = ["cars", "pets", "travel", "hi-tech", "sport", "music", "books", "tv", "cinema", "geek", "otus"]
     return random.sample(interests, 2)
+
+
+def get_interests_many(store, client_ids):
+    return {cid: get_interests(store, cid) for cid in client_ids}
+
+
+async def get_score_async(store, phone, email, birthday=None, gender=None, first_name=None, last_name=None):
+    return get_score(store, phone, email, birthday=birthday, gender=gender, first_name=first_name, last_name=last_name)
+
+
+async def get_interests_async(store, cid):
+    return get_interests(store, cid)
@@ -4,7 +4,12 @@
 import hashlib
 import datetime
 import functools
+import http.client
+import json
+import threading
 import unittest
+import urllib.request
+from http.server import ThreadingHTTPServer
 
 import api
 
@@ -42,6 +47,17 @@ class TestSuite(unittest.TestCase):
         _, code = self.get_response({})
         self.assertEqual(api.INVALID_REQUEST, code)
 
+    @cases([
+        [],
+        [1, 2, 3],
+        "abc",
+        123,
+    ])
+    def test_not_dict_request(self, request):
+        response, code = self.get_response(request)
+        self.assertEqual(api.INVALID_REQUEST, code, request)
+        self.assertTrue(len(response))
+
     @cases([
         {
             "account": "horns&hoofs",
@@ -269,5 +285,105 @@ class TestSuite(unittest.TestCase):
         self.assertEqual(self.context.get("nclients"), len(arguments["client_ids"]))
 
 
+class TestValidateMany(unittest.TestCase):
+    def test_validate_many(self):
+        holders, error_msgs = api.ClientsInterestsRequest.validate_many([
+            {
+                "client_ids": [1, 2],
+                "date": "19.07.2017"
+            },
+            {
+                "client_ids": ["1", "2"]
+            },
+            {
+                "date": "19.07.2017"
+            },
+        ])
+        self.assertEqual(3, len(holders))
+        self.assertIsNotNone(holders[0])
+        self.assertEqual([1, 2], holders[0].client_ids)
+        self.assertIsNone(holders[1])
+        self.assertIsNone(holders[2])
+        self.assertEqual([
+            '1: client_ids: field must be list of numbers',
+            '2: client_ids: required field absent',
+        ], error_msgs)
+
+
+class TestHTTPSuite(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("localhost", 0), api.MainHTTPHandler)
+        cls.port = cls.server.server_address[1]
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def post_method(self, request):
+        body = json.dumps(request).encode('utf-8')
+        post = urllib.request.Request(
+            "http://localhost:%d/method" % self.port, data=body, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(post, timeout=5) as response:
+            return json.loads(response.read()), response.status
+
+    def test_ok_interests_http_request(self):
+        request = {
+            "account": "horns&hoofs",
+            "login": "h&f",
+            "method": "clients_interests",
+            "arguments": {
+                "client_ids": [1, 2, 3]
+            }
+        }
+        hash_str = request["account"] + request["login"] + api.SALT
+        request["token"] = hashlib.sha512(hash_str.encode('utf-8')).hexdigest()
+        r, status = self.post_method(request)
+        self.assertEqual(api.OK, status)
+        self.assertEqual(api.OK, r["code"])
+        interests_dict = r["response"]
+        self.assertEqual(sorted(interests_dict), ["1", "2", "3"])
+        self.assertTrue(all(v and isinstance(v, list) for v in interests_dict.values()))
+
+    def test_keep_alive_does_not_block_other_clients(self):
+        held = http.client.HTTPConnection("localhost", self.port, timeout=5)
+        try:
+            held.request("GET", "/ping")
+            response = held.getresponse()
+            response.read()
+            self.assertEqual(api.OK, response.status)
+            other = http.client.HTTPConnection("localhost", self.port, timeout=5)
+            try:
+                other.request("GET", "/ping")
+                response = other.getresponse()
+                response.read()
+                self.assertEqual(api.OK, response.status)
+            finally:
+                other.close()
+        finally:
+            held.close()
+
+    def test_ok_score_http_request(self):
+        request = {
+            "account": "horns&hoofs",
+            "login": "h&f",
+            "method": "online_score",
+            "arguments": {
+                "phone": "79175002040",
+                "email": "stupnikov@otus.ru"
+            }
+        }
+        hash_str = request["account"] + request["login"] + api.SALT
+        request["token"] = hashlib.sha512(hash_str.encode('utf-8')).hexdigest()
+        r, status = self.post_method(request)
+        self.assertEqual(api.OK, status)
+        self.assertEqual(api.OK, r["code"])
+        score = r["response"].get("score")
+        self.assertTrue(isinstance(score, (int, float)) and score >= 0)
+
+
 if __name__ == "__main__":
     unittest.main()